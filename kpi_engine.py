@@ -0,0 +1,144 @@
+"""
+Расчёт KPI по столбцам задач на NumPy.
+Модуль не импортирует Flask и базу, поэтому его можно загружать в процессах пула отчётов.
+"""
+from datetime import datetime
+
+import numpy as np
+
+
+# Веса для расчёта KPI
+KPI_DIFFICULTY_WEIGHTS = {'Легко': 1, 'Средне': 2, 'Сложно': 3}
+KPI_PRIORITY_WEIGHTS = {'Низкий': 0.5, 'Средний': 1, 'Высокий': 1.5}
+KPI_OVERDUE_PENALTY = 0.5  # Штраф за просрочку
+KPI_LATE_COMPLETION_PENALTY = 0.8  # Штраф за выполнение с опозданием (80% от веса задачи)
+KPI_NO_USER = -1  # Заполнитель для задач без создателя или ответственного
+
+
+class KpiFrame:
+    """
+    Столбцы задач, нужные для KPI, в массивах NumPy.
+    Одна строка — одна задача; веса и статусы считаются векторно для всех строк сразу.
+    """
+
+    columns = ('user_id', 'assigned_to_id', 'difficulty', 'priority', 'status', 'due_date')
+
+    def __init__(self, user_ids, assigned_to_ids, difficulties, priorities, statuses, due_dates):
+        self.user_ids = user_ids
+        self.assigned_to_ids = assigned_to_ids
+        self.difficulties = difficulties
+        self.priorities = priorities
+        self.statuses = statuses
+        self.due_dates = due_dates
+
+    def __len__(self):
+        return len(self.statuses)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Строит кадр из кортежей (user_id, assigned_to_id, difficulty, priority, status, due_date)."""
+        rows = list(rows)
+        user_ids, assigned_to_ids, difficulties, priorities, statuses, due_dates = (
+            zip(*rows) if rows else ((),) * len(cls.columns)
+        )
+        return cls(
+            np.array([KPI_NO_USER if value is None else value for value in user_ids], dtype=np.int64),
+            np.array([KPI_NO_USER if value is None else value for value in assigned_to_ids], dtype=np.int64),
+            np.array(difficulties, dtype=object),
+            np.array(priorities, dtype=object),
+            np.array(statuses, dtype=object),
+            np.array(due_dates, dtype='datetime64[us]'),
+        )
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        return cls.from_rows(
+            (task.user_id, task.assigned_to_id, task.difficulty, task.priority, task.status, task.due_date)
+            for task in tasks
+        )
+
+    def weights(self):
+        difficulty = np.array([KPI_DIFFICULTY_WEIGHTS.get(value, 1) for value in self.difficulties], dtype=float)
+        priority = np.array([KPI_PRIORITY_WEIGHTS.get(value, 1) for value in self.priorities], dtype=float)
+        return difficulty * priority
+
+    def components(self, now=None):
+        """
+        Взвешенные вклады каждой задачи: (общий вес, вовремя, с опозданием, просрочено).
+        Задача без срока считается завершённой с опозданием, как и раньше при сравнении с now.
+        """
+        now = np.datetime64(now or datetime.utcnow(), 'us')
+        weights = self.weights()
+        completed = self.statuses == 'Completed'
+        on_time = completed & (self.due_dates >= now)
+        late = completed & ~on_time
+        overdue = self.statuses == 'Просрочено'
+        return (
+            weights,
+            np.where(on_time, weights, 0.0),
+            np.where(late, weights * KPI_LATE_COMPLETION_PENALTY, 0.0),
+            np.where(overdue, weights * KPI_OVERDUE_PENALTY, 0.0),
+        )
+
+
+def kpi_percent(total, on_time, late):
+    """KPI в процентах; работает и для чисел, и для массивов."""
+    total = np.asarray(total, dtype=float)
+    done = np.asarray(on_time, dtype=float) + np.asarray(late, dtype=float)
+    score = np.divide(done * 100, total, out=np.zeros_like(total), where=total > 0)
+    return np.round(score, 2)
+
+
+def kpi_result(total, on_time, late, overdue, tasks):
+    return {
+        'kpi': float(kpi_percent(total, on_time, late)),
+        'total_weight': float(total),
+        'on_time_weight': float(on_time),
+        'late_weight': float(late),
+        'overdue_weight': float(overdue),
+        'tasks': int(tasks),
+    }
+
+
+def kpi_summary(frame, now=None):
+    """KPI по всем задачам кадра — скалярный вариант."""
+    total, on_time, late, overdue = (part.sum() for part in frame.components(now))
+    return kpi_result(total, on_time, late, overdue, len(frame))
+
+
+def kpi_by_user(frame, user_ids=None, now=None):
+    """
+    KPI всех пользователей за один проход.
+    Задача учитывается у создателя и у ответственного (один раз, если это один человек),
+    поэтому строки разворачиваются в пары (пользователь, задача) и сворачиваются через bincount.
+    """
+    parts = frame.components(now)
+    own = frame.user_ids != KPI_NO_USER
+    assigned = (frame.assigned_to_ids != KPI_NO_USER) & (frame.assigned_to_ids != frame.user_ids)
+    owners = np.concatenate([frame.user_ids[own], frame.assigned_to_ids[assigned]])
+    rows = np.concatenate([np.flatnonzero(own), np.flatnonzero(assigned)])
+
+    keys, groups = np.unique(owners, return_inverse=True)
+    sums = [np.bincount(groups, weights=part[rows], minlength=len(keys)) for part in parts]
+    counts = np.bincount(groups, minlength=len(keys))
+    scores = kpi_percent(sums[0], sums[1], sums[2])
+
+    empty = kpi_result(0, 0, 0, 0, 0)
+    result = {int(user_id): dict(empty) for user_id in (user_ids or ())}
+    for index, user_id in enumerate(keys.tolist()):
+        if user_ids is not None and user_id not in result:
+            continue
+        result[user_id] = {
+            'kpi': float(scores[index]),
+            'total_weight': float(sums[0][index]),
+            'on_time_weight': float(sums[1][index]),
+            'late_weight': float(sums[2][index]),
+            'overdue_weight': float(sums[3][index]),
+            'tasks': int(counts[index]),
+        }
+    return result
+
+
+
+def kpi_task_weight(difficulty, priority):
+    return KPI_DIFFICULTY_WEIGHTS.get(difficulty, 1) * KPI_PRIORITY_WEIGHTS.get(priority, 1)
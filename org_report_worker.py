@@ -0,0 +1,63 @@
+"""
+Листы проектов для отчёта по организации.
+Функции выполняются в пуле процессов: модуль не импортирует приложение, а получает только простые значения.
+"""
+from collections import Counter
+
+from kpi_engine import KpiFrame, kpi_by_user, kpi_summary, kpi_task_weight
+
+
+def render_project_sheet(project, now):
+    """
+    Строки листа проекта: разбивка задач, KPI участников и список просроченных задач.
+    Выполняется в отдельном процессе, поэтому работает только с переданными значениями.
+    """
+    tasks = project['tasks']
+    usernames = project['usernames']
+    frame = KpiFrame.from_rows(
+        (task['user_id'], task['assigned_to_id'], task['difficulty'], task['priority'], task['status'], task['due_date'])
+        for task in tasks
+    )
+    summary = kpi_summary(frame, now)
+    members = kpi_by_user(frame, project['member_ids'], now)
+
+    rows = [
+        ['Проект', project['name']],
+        ['Владелец', usernames.get(project['owner_id'], '')],
+        ['Задач', len(tasks)],
+        ['KPI проекта', summary['kpi']],
+        [],
+        ['Задачи по статусам', 'Количество', 'Вес'],
+    ]
+    statuses = Counter(task['status'] for task in tasks)
+    status_weights = Counter()
+    for task in tasks:
+        status_weights[task['status']] += kpi_task_weight(task['difficulty'], task['priority'])
+    rows += [[status, count, status_weights[status]] for status, count in statuses.most_common()]
+
+    rows += [[], ['Задачи по приоритетам', 'Количество']]
+    rows += [[priority, count] for priority, count in Counter(task['priority'] for task in tasks).most_common()]
+
+    rows += [[], ['KPI участников', 'Задач', 'KPI', 'Вес просроченных']]
+    for user_id in project['member_ids']:
+        result = members[user_id]
+        rows.append([usernames.get(user_id, user_id), result['tasks'], result['kpi'], result['overdue_weight']])
+
+    overdue = sorted(
+        (task for task in tasks
+         if task['status'] == 'Просрочено' or (task['status'] != 'Completed' and task['due_date'] < now)),
+        key=lambda task: task['due_date']
+    )
+    rows += [[], ['Просроченные задачи', 'Срок', 'Ответственный', 'Дней просрочки']]
+    for task in overdue:
+        rows.append([
+            task['title'], task['due_date'].strftime('%Y-%m-%d'),
+            usernames.get(task['assigned_to_id'], 'Не назначен'), (now - task['due_date']).days
+        ])
+
+    completed = statuses.get('Completed', 0)
+    return {
+        'project_id': project['id'],
+        'rows': rows,
+        'summary': [project['name'], len(tasks), completed, len(overdue), len(tasks) - completed, summary['kpi']],
+    }
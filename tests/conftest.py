@@ -0,0 +1,83 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Тесты идут на SQLite в памяти: поиск работает через резервный индекс, а не через GIN-индексы PostgreSQL
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def app(monkeypatch):
+    flask_app = app_module.app
+    flask_app.config.update(TESTING=True, BACKGROUND_WORKERS=False)
+    monkeypatch.setattr(app_module, 'search_index', app_module.InvertedIndex())
+    # Контекст приложения не держим открытым: иначе запросы тестового клиента делят его,
+    # а вместе с ним сессию БД и пользователя Flask-Login в g
+    with flask_app.app_context():
+        app_module.db.create_all()
+    yield flask_app
+    with flask_app.app_context():
+        app_module.db.drop_all()
+
+
+@pytest.fixture
+def users(app):
+    """Администратор и три пользователя: alice и bob — участники проекта, carol — нет."""
+    db = app_module.db
+    with app.app_context():
+        admin_role = app_module.Role(role_name='Admin')
+        user_role = app_module.Role(role_name='User')
+        db.session.add_all([admin_role, user_role])
+        db.session.flush()
+        accounts = {
+            'admin': app_module.User(username='admin', password='x', role_id=admin_role.id),
+            'alice': app_module.User(username='alice', password='x', role_id=user_role.id),
+            'bob': app_module.User(username='bob', password='x', role_id=user_role.id),
+            'carol': app_module.User(username='carol', password='x', role_id=user_role.id),
+        }
+        db.session.add_all(accounts.values())
+        db.session.commit()
+        return {name: user.id for name, user in accounts.items()}
+
+
+@pytest.fixture
+def project(app, users):
+    db = app_module.db
+    with app.app_context():
+        project = app_module.Project(name='Запуск', owner_id=users['alice'])
+        project.members.append(db.session.get(app_module.User, users['bob']))
+        db.session.add(project)
+        db.session.commit()
+        return project.id
+
+
+@pytest.fixture
+def make_task(app, users, project):
+    def make_task(title, description='', **fields):
+        values = dict(
+            title=title, description=description, priority='Средний', status='In Progress', difficulty='Средне',
+            due_date=datetime.utcnow() + timedelta(days=7), user_id=users['alice'], project_id=project
+        )
+        values.update(fields)
+        with app.app_context():
+            task = app_module.Task(**values)
+            app_module.db.session.add(task)
+            app_module.db.session.commit()
+            return task.id
+    return make_task
+
+
+@pytest.fixture
+def login(app):
+    def login(user_id):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+        return client
+    return login
@@ -0,0 +1,103 @@
+import app as app_module
+
+
+def search(client, query, **params):
+    response = client.get('/search', query_string={'q': query, **params})
+    assert response.status_code == 200
+    return response.get_json()['results']
+
+
+def send_message(client, receiver_id, content):
+    response = client.post('/chat/new_message', data={'receiver_id': receiver_id, 'content': content})
+    assert response.get_json()['status'] == 'success'
+
+
+def post_to_channel(client, channel_id, content):
+    response = client.post(f'/chat/channel/{channel_id}', data={'content': content})
+    assert response.get_json()['status'] == 'success'
+
+
+def project_channel_id(project_id):
+    with app_module.app.app_context():
+        channel = app_module.sync_project_channel(app_module.db.session.get(app_module.Project, project_id))
+        app_module.db.session.commit()
+        return channel.id
+
+
+def test_ranks_by_term_frequency_and_highlights_prefix_matches(users, login):
+    alice = login(users['alice'])
+    send_message(alice, users['bob'], 'Отчёт готов, отчёт отправлен')
+    send_message(alice, users['bob'], 'Отчётный период закрыт')
+    send_message(alice, users['bob'], 'Совсем другая тема')
+
+    results = search(alice, 'отчет')
+    assert [hit['kind'] for hit in results] == ['message', 'message']
+    # Два точных вхождения весят больше одного префиксного
+    assert results[0]['snippet'] == '<mark>Отчёт</mark> готов, <mark>отчёт</mark> отправлен'
+    assert results[1]['snippet'] == '<mark>Отчётный</mark> период закрыт'
+    assert results[0]['rank'] > results[1]['rank']
+
+
+def test_highlight_escapes_message_html(users, login):
+    alice = login(users['alice'])
+    send_message(alice, users['bob'], '<b>бюджет</b> утверждён')
+
+    [hit] = search(alice, 'бюджет')
+    assert hit['snippet'] == '&lt;b&gt;<mark>бюджет</mark>&lt;/b&gt; утверждён'
+
+
+def test_direct_messages_are_visible_only_to_participants(users, login):
+    send_message(login(users['alice']), users['bob'], 'Пароль от стенда в сейфе')
+
+    assert len(search(login(users['bob']), 'стенда')) == 1
+    assert search(login(users['carol']), 'стенда') == []
+
+
+def test_project_channel_messages_are_visible_only_to_members(users, project, login):
+    channel_id = project_channel_id(project)
+    post_to_channel(login(users['alice']), channel_id, 'Релиз переносится на пятницу')
+
+    assert len(search(login(users['bob']), 'релиз')) == 1
+    assert search(login(users['carol']), 'релиз') == []
+
+
+def test_comments_follow_task_visibility(users, make_task, login):
+    task_id = make_task('Миграция базы')
+    alice = login(users['alice'])
+    response = alice.post(f'/task/{task_id}/add_comment', json={'comment': 'Нужен бэкап перед миграцией'})
+    assert response.status_code == 200
+
+    assert [hit['kind'] for hit in search(login(users['bob']), 'бэкап')] == ['comment']
+    assert search(login(users['carol']), 'бэкап') == []
+    assert len(search(login(users['admin']), 'бэкап')) == 1
+
+
+def test_index_follows_new_and_edited_documents(users, make_task, login):
+    alice = login(users['alice'])
+    # Первый поиск заполняет индекс, дальше его обновляют сами маршруты
+    assert search(alice, 'дедлайн') == []
+    assert app_module.search_index.loaded
+
+    send_message(alice, users['bob'], 'Дедлайн сдвинули')
+    task_id = make_task('Документация')
+    comment = alice.post(f'/task/{task_id}/add_comment', json={'comment': 'Черновик раздела'}).get_json()['comment']
+
+    assert [hit['kind'] for hit in search(alice, 'дедлайн')] == ['message']
+    assert [hit['id'] for hit in search(alice, 'черновик', scope='comments')] == [comment['id']]
+
+    response = alice.put(f'/task/{task_id}/edit_comment/{comment["id"]}', json={'comment': 'Финальная версия раздела'})
+    assert response.status_code == 200
+    assert search(alice, 'черновик') == []
+    assert [hit['id'] for hit in search(alice, 'финальная')] == [comment['id']]
+
+
+def test_general_channel_is_searchable_before_first_visit(users, login):
+    with app_module.app.app_context():
+        channel_id = app_module.get_general_channel().id
+    post_to_channel(login(users['alice']), channel_id, 'Собрание в четверг')
+
+    # Администратор и carol ещё не открывали общую группу, поэтому не состоят в ней
+    with app_module.app.app_context():
+        assert app_module.db.session.get(app_module.ChannelMember, (channel_id, users['admin'])) is None
+    assert len(search(login(users['admin']), 'собрание')) == 1
+    assert len(search(login(users['carol']), 'собрание')) == 1
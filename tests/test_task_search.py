@@ -0,0 +1,63 @@
+import app as app_module
+
+
+def search_tasks(client, query):
+    response = client.get('/tasks/search', query_string={'q': query})
+    assert response.status_code == 200
+    return response.get_json()['results']
+
+
+def test_prefix_match_highlights_whole_word(users, make_task, login):
+    task_id = make_task('Миграция базы данных', 'Перенести таблицы на новый сервер')
+
+    [hit] = search_tasks(login(users['alice']), 'мигр')
+    assert hit['id'] == task_id
+    assert hit['title'] == '<mark>Миграция</mark> базы данных'
+
+
+def test_typo_falls_back_to_similar_words(users, make_task, login):
+    task_id = make_task('Миграция базы данных')
+    make_task('Обновить документацию')
+
+    [hit] = search_tasks(login(users['alice']), 'миграцея')
+    assert hit['id'] == task_id
+    # Подсвечивается слово из задачи, а не опечатка из запроса
+    assert hit['title'] == '<mark>Миграция</mark> базы данных'
+
+
+def test_exact_matches_rank_above_prefix_matches(users, make_task, login):
+    prefix_only = make_task('Отчётность за квартал')
+    single = make_task('Отчёт по продажам')
+    repeated = make_task('Отчёт для совета', 'Свести отчёт по регионам')
+    make_task('Обновить документацию')
+
+    results = search_tasks(login(users['alice']), 'отчет')
+    assert [hit['id'] for hit in results] == [repeated, single, prefix_only]
+    assert results[0]['snippet'] == 'Свести <mark>отчёт</mark> по регионам'
+
+
+def test_results_follow_task_visibility(users, make_task, login):
+    make_task('Аудит доступа')
+
+    assert len(search_tasks(login(users['bob']), 'аудит')) == 1
+    assert len(search_tasks(login(users['admin']), 'аудит')) == 1
+    assert search_tasks(login(users['carol']), 'аудит') == []
+
+
+def test_index_follows_task_edit_and_delete(users, make_task, login):
+    task_id = make_task('Миграция базы данных')
+    alice = login(users['alice'])
+    assert len(search_tasks(alice, 'миграция')) == 1
+    assert app_module.search_index.loaded
+
+    response = alice.post(f'/task/edit/{task_id}', data={
+        'title': 'Перенос сервера', 'description': 'Новая площадка', 'due_date': '2030-01-01',
+        'difficulty': '2', 'priority': 'Высокий', 'status': 'In Progress',
+    })
+    assert response.status_code == 302
+    assert search_tasks(alice, 'миграция') == []
+    assert [hit['id'] for hit in search_tasks(alice, 'площадка')] == [task_id]
+
+    assert alice.post(f'/task/delete/{task_id}').status_code == 302
+    # Удалённую задачу отсёк бы и запрос к базе, поэтому проверяем сам индекс
+    assert app_module.search_index.search('перенос') == []